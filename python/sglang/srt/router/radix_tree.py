@@ -0,0 +1,211 @@
+"""
+Copyright 2023-2024 SGLang Team
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+A radix tree on token ids. The router keeps one tree per worker to
+approximate the prefix cache state of that worker's KV cache.
+"""
+
+from typing import List, Union
+
+import numpy as np
+
+TokenIds = Union[List[int], np.ndarray]
+
+
+class Node:
+    # Thousands of nodes per worker tree stay resident; __slots__ drops
+    # the per-instance __dict__ so more of a descent fits in cache.
+    __slots__ = ("children", "ids", "count", "max_depth")
+
+    def __init__(self):
+        # Children keyed by their first token id. Siblings in a radix tree
+        # always start with distinct tokens, so at most one child can match.
+        self.children = {}
+        self.ids = np.empty(0, dtype=np.int32)
+        self.count = 0
+        # Length in tokens of the longest stored path from the start of
+        # this node's ids down to a leaf. Lets dispatch skip whole trees
+        # that cannot beat the best match found so far.
+        self.max_depth = 0
+
+
+class RadixTree:
+    # Compare granularity of _ids_prefix_match. Large enough that the
+    # common fully-matching case stays a handful of vectorized calls,
+    # small enough that an early divergence does not pay for comparing
+    # the whole buffer.
+    MATCH_CHUNK = 4096
+
+    def __init__(self):
+        self.root = Node()
+
+    def _ids_prefix_match(self, ids1: np.ndarray, ids2: np.ndarray) -> int:
+        """Return the length of the common prefix of ids1 and ids2."""
+        n = min(len(ids1), len(ids2))
+        for start in range(0, n, self.MATCH_CHUNK):
+            stop = min(start + self.MATCH_CHUNK, n)
+            diff = np.not_equal(ids1[start:stop], ids2[start:stop])
+            # argmax is 0 both for "first element differs" and "no
+            # difference"; one indexed load disambiguates, avoiding a
+            # separate any() pass over the chunk.
+            idx = int(diff.argmax())
+            if diff[idx]:
+                return start + idx
+        return n
+
+    def insert(self, ids: TokenIds):
+        ids = np.asarray(ids, dtype=np.int32)
+        curr = self.root
+        curr.count += 1
+        curr.max_depth = max(curr.max_depth, len(ids))
+        while len(ids) > 0:
+            child = curr.children.get(int(ids[0]))
+            if child is None:
+                new_node = Node()
+                new_node.ids = ids
+                new_node.count = 1
+                new_node.max_depth = len(ids)
+                curr.children[int(ids[0])] = new_node
+                return
+            prefix_len = self._ids_prefix_match(child.ids, ids)
+            if prefix_len < len(child.ids):
+                # Split the child at the divergence point. The slices are
+                # views into the child's original buffer, so a split never
+                # copies token ids.
+                new_node = Node()
+                new_node.ids = child.ids[prefix_len:]
+                new_node.children = child.children
+                new_node.count = child.count
+                new_node.max_depth = child.max_depth - prefix_len
+                child.ids = child.ids[:prefix_len]
+                child.children = {int(new_node.ids[0]): new_node}
+            child.count += 1
+            # len(ids) is measured from the start of child's ids here.
+            child.max_depth = max(child.max_depth, len(ids))
+            curr = child
+            ids = ids[prefix_len:]
+
+    def prefix_match(self, ids: TokenIds, prune_len: int = 0) -> np.ndarray:
+        """Return the longest prefix of ids that is stored in the tree.
+
+        If prune_len is given, the descent stops as soon as it can prove
+        the final match cannot exceed prune_len tokens; the result is
+        then only a lower bound. Exactness is guaranteed whenever the
+        true match is longer than prune_len, which is all the caller
+        ranking trees by match length needs.
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        curr = self.root
+        depth = 0
+        rest = ids
+        while len(rest) > 0:
+            child = curr.children.get(int(rest[0]))
+            if child is None:
+                break
+            if depth + child.max_depth <= prune_len:
+                break
+            prefix_len = self._ids_prefix_match(child.ids, rest)
+            depth += prefix_len
+            if prefix_len < len(child.ids):
+                break
+            curr = child
+            rest = rest[prefix_len:]
+        # The matched tokens equal the head of the input, so return a view
+        # of the input instead of concatenating per-node copies.
+        return ids[:depth]
+
+    def delete(self, ids: TokenIds):
+        """Delete one reference of ids, which must have been inserted before."""
+        ids = np.asarray(ids, dtype=np.int32)
+        curr = self.root
+        curr.count -= 1
+        path = [curr]
+        while len(ids) > 0:
+            child = curr.children.get(int(ids[0]))
+            if child is None:
+                raise ValueError(f"ids {ids} not found in the tree")
+            child.count -= 1
+            if child.count == 0:
+                del curr.children[int(ids[0])]
+                break
+            path.append(child)
+            curr = child
+            ids = ids[len(child.ids) :]
+        # Deletion may have removed the deepest stored path; recompute
+        # max_depth bottom-up along the visited path.
+        for node in reversed(path):
+            node.max_depth = len(node.ids) + max(
+                (c.max_depth for c in node.children.values()), default=0
+            )
+
+    def truncate(self, ids: TokenIds, keep_len: int):
+        """Shrink one reference of ids down to its first keep_len tokens.
+
+        Equivalent to delete(ids) followed by insert(ids[:keep_len]), but
+        walks the tree once and only mutates nodes past the kept prefix.
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        if keep_len >= len(ids):
+            return
+        curr = self.root
+        path = [curr]
+        rest = ids
+        remaining = keep_len
+        # Walk the kept prefix; reference counts there are unchanged.
+        while remaining > 0:
+            child = curr.children.get(int(rest[0]))
+            if child is None:
+                raise ValueError(f"ids {ids} not found in the tree")
+            if len(child.ids) > remaining:
+                # The keep boundary falls inside this node; split so the
+                # kept part ends exactly at the boundary.
+                new_node = Node()
+                new_node.ids = child.ids[remaining:]
+                new_node.children = child.children
+                new_node.count = child.count
+                new_node.max_depth = child.max_depth - remaining
+                child.ids = child.ids[:remaining]
+                child.children = {int(new_node.ids[0]): new_node}
+            path.append(child)
+            curr = child
+            rest = rest[len(child.ids) :]
+            remaining -= len(child.ids)
+        # Drop this reference from the uncached tail.
+        while len(rest) > 0:
+            child = curr.children.get(int(rest[0]))
+            if child is None:
+                raise ValueError(f"ids {ids} not found in the tree")
+            child.count -= 1
+            if child.count == 0:
+                del curr.children[int(rest[0])]
+                break
+            path.append(child)
+            curr = child
+            rest = rest[len(child.ids) :]
+        for node in reversed(path):
+            node.max_depth = len(node.ids) + max(
+                (c.max_depth for c in node.children.values()), default=0
+            )
+
+    def pretty_print(self):
+        # Explicit DFS stack: a tree of single-token chains can nest far
+        # deeper than CPython's default recursion limit.
+        stack = [(self.root, 0)]
+        while stack:
+            node, indent = stack.pop()
+            print(" " * indent + f"{list(node.ids)} (count={node.count})")
+            for child in reversed(list(node.children.values())):
+                stack.append((child, indent + 2))
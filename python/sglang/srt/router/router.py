@@ -0,0 +1,234 @@
+"""
+Copyright 2023-2024 SGLang Team
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Routers that dispatch generate requests across multiple SRT workers.
+
+- RandomRouter: pick a worker uniformly at random.
+- RoundRobinRouter: cycle through the workers.
+- ApproxTreeRouter: pick the worker whose approximate radix cache shares
+  the longest prefix with the request, falling back to the least loaded
+  worker on a cache miss.
+"""
+
+import heapq
+import random
+from dataclasses import fields
+from typing import List
+
+import httpx
+import orjson
+
+from sglang.srt.hf_transformers_utils import get_tokenizer
+from sglang.srt.managers.io_struct import GenerateReqInput
+from sglang.srt.router.radix_tree import RadixTree
+from sglang.srt.router.token_cache import PrefixTokenCache
+
+# Serialize with orjson and post raw bytes so httpx's slower stdlib-json
+# path is bypassed on the per-request hot path.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_asdict_funcs = {}
+
+
+def _fast_asdict(obj):
+    """A per-class precompiled replacement for dataclasses.asdict.
+
+    dataclasses.asdict re-introspects the class and deep-copies every
+    value on each call. The request objects here are flat dataclasses,
+    so we generate a function returning a dict literal over the known
+    fields once per class and reuse it for every request.
+    """
+    fn = _asdict_funcs.get(type(obj))
+    if fn is None:
+        cls = type(obj)
+        items = ", ".join(f'"{f.name}": o.{f.name}' for f in fields(cls))
+        namespace = {}
+        exec(f"def _to_dict(o): return {{{items}}}", namespace)
+        fn = _asdict_funcs[cls] = namespace["_to_dict"]
+    return fn(obj)
+
+
+class BaseRouter:
+    def __init__(self, server_urls: List[str]):
+        self.server_urls = server_urls
+        self.worker_list = list(server_urls)
+        self._n_workers = len(self.worker_list)
+        self.client = httpx.AsyncClient()
+
+    def add_worker(self, url: str):
+        self.server_urls.append(url)
+        self.worker_list.append(url)
+        self._n_workers = len(self.worker_list)
+
+    def remove_worker(self, url: str):
+        self.server_urls.remove(url)
+        self.worker_list.remove(url)
+        self._n_workers = len(self.worker_list)
+
+    async def dispatch(self, obj: GenerateReqInput):
+        raise NotImplementedError()
+
+
+class RandomRouter(BaseRouter):
+    def calc_priority(self):
+        return self.worker_list[random.randrange(self._n_workers)]
+
+    async def dispatch(self, obj: GenerateReqInput):
+        url = self.calc_priority()
+        res = await self.client.post(
+            f"{url}/generate",
+            content=orjson.dumps(_fast_asdict(obj)),
+            headers=_JSON_HEADERS,
+        )
+        return orjson.loads(res.content)
+
+
+class RoundRobinRouter(BaseRouter):
+    def __init__(self, server_urls: List[str]):
+        super().__init__(server_urls)
+        self.idx = 0
+
+    async def dispatch(self, obj: GenerateReqInput):
+        # self.idx is kept pre-modded, so no modulo on the hot path. The
+        # >= check also resets cleanly after remove_worker shrinks the list.
+        if self.idx >= self._n_workers:
+            self.idx = 0
+        url = self.worker_list[self.idx]
+        self.idx += 1
+        res = await self.client.post(
+            f"{url}/generate",
+            content=orjson.dumps(_fast_asdict(obj)),
+            headers=_JSON_HEADERS,
+        )
+        return orjson.loads(res.content)
+
+
+class ApproxTreeRouter(BaseRouter):
+    def __init__(
+        self,
+        tokenizer_path: str,
+        server_urls: List[str],
+        miss_threshold: float = 0.5,
+    ):
+        super().__init__(server_urls)
+        self.tokenizer = get_tokenizer(tokenizer_path)
+        self.token_cache = PrefixTokenCache(self.tokenizer)
+        self.miss_threshold = miss_threshold
+        self.url_to_tree = {url: RadixTree() for url in server_urls}
+        # Materialized once so the dispatch scoring loop iterates a flat
+        # tuple instead of a dict items view per request.
+        self._url_tree_pairs = tuple(self.url_to_tree.items())
+        self.url_to_count = {url: 0 for url in server_urls}
+        # Min-heap of (in_flight_count, url) with lazy deletion: stale
+        # entries are skipped on pop by checking against url_to_count,
+        # so the cache-miss fallback is O(log n) instead of a dict scan.
+        self._count_heap = [(0, url) for url in server_urls]
+        heapq.heapify(self._count_heap)
+
+    def add_worker(self, url: str):
+        super().add_worker(url)
+        self.url_to_tree[url] = RadixTree()
+        self._url_tree_pairs = tuple(self.url_to_tree.items())
+        self.url_to_count[url] = 0
+        heapq.heappush(self._count_heap, (0, url))
+
+    def remove_worker(self, url: str):
+        super().remove_worker(url)
+        del self.url_to_tree[url]
+        self._url_tree_pairs = tuple(self.url_to_tree.items())
+        # Heap entries for the removed url become stale and are dropped
+        # lazily in _least_loaded_url.
+        del self.url_to_count[url]
+
+    def prewarm(self, texts: List[str]):
+        """Seed every worker tree with known system prompts or templates.
+
+        Freshly started routers otherwise pay full-length cache misses
+        until the trees fill up; call this at boot with the deployment's
+        fixed prompts so the first real requests match immediately. Each
+        text is tokenized once (warming the prefix token cache as a side
+        effect) and inserted into all trees.
+        """
+        for text in texts:
+            input_ids = self.token_cache.encode(text)
+            for tree in self.url_to_tree.values():
+                tree.insert(input_ids)
+
+    def _bump_count(self, url: str, delta: int):
+        count = self.url_to_count[url] + delta
+        self.url_to_count[url] = count
+        if len(self._count_heap) > 8 * self._n_workers + 64:
+            # Compact the lazily-deleted entries once in a while.
+            self._count_heap = [(c, u) for u, c in self.url_to_count.items()]
+            heapq.heapify(self._count_heap)
+        else:
+            heapq.heappush(self._count_heap, (count, url))
+
+    def _least_loaded_url(self) -> str:
+        heap = self._count_heap
+        while True:
+            count, url = heap[0]
+            if self.url_to_count.get(url) == count:
+                return url
+            heapq.heappop(heap)
+
+    async def dispatch(self, obj: GenerateReqInput):
+        input_ids = self.token_cache.encode(obj.text)
+        n = len(input_ids)
+
+        highest_url = None
+        best_len = 0
+        for url, tree in self._url_tree_pairs:
+            # A tree whose deepest stored path is no longer than the best
+            # match so far cannot beat it; skip the descent entirely.
+            if tree.root.max_depth <= best_len:
+                continue
+            matched_ids = tree.prefix_match(input_ids, prune_len=best_len)
+            if len(matched_ids) > best_len:
+                best_len = len(matched_ids)
+                highest_url = url
+
+        # Compare token counts directly; the match rate division is only
+        # implied by the threshold check.
+        if highest_url is None or best_len < self.miss_threshold * n:
+            # Cache miss: fall back to the least loaded worker.
+            highest_url = self._least_loaded_url()
+
+        # Optimistically insert the full prompt, then correct it below with
+        # the number of tokens the worker actually kept in its cache. The
+        # truncate must also run when the request fails or the worker
+        # returns an error body: rolling back only url_to_count would
+        # leave a phantom full-length prefix that keeps attracting
+        # retries of the same prompt to a broken worker.
+        tree = self.url_to_tree[highest_url]
+        tree.insert(input_ids)
+        self._bump_count(highest_url, 1)
+        cached_tokens = 0
+        try:
+            res = await self.client.post(
+                f"{highest_url}/generate",
+                content=orjson.dumps(_fast_asdict(obj)),
+                headers=_JSON_HEADERS,
+            )
+            ret = orjson.loads(res.content)
+            meta_info = ret.get("meta_info")
+            if meta_info is not None:
+                cached_tokens = meta_info.get("cached_tokens", 0)
+        finally:
+            self._bump_count(highest_url, -1)
+            tree.truncate(input_ids, cached_tokens)
+
+        return ret
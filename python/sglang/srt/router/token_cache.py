@@ -0,0 +1,79 @@
+"""
+Copyright 2023-2024 SGLang Team
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+An LRU cache for tokenizing prompts that share a long fixed prefix.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PrefixTokenCache:
+    """Cache token ids of the shared head of prompts.
+
+    Chat and agent workloads resend the same system prompt on every
+    request, so the router re-tokenizes an identical head thousands of
+    times. We cache the token ids of the head (cut at a newline boundary
+    so BPE merges cannot straddle the cache seam) and only tokenize the
+    per-request tail on a hit.
+    """
+
+    def __init__(self, tokenizer, prefix_chars: int = 1024, capacity: int = 128):
+        self.tokenizer = tokenizer
+        self.prefix_chars = prefix_chars
+        self.capacity = capacity
+        # prefix string -> np.int32 token ids. Keying on the string makes
+        # CPython's string hash the rolling hash of the head for us.
+        self._cache = OrderedDict()
+
+    def encode(self, text: str) -> np.ndarray:
+        if len(text) <= self.prefix_chars:
+            return np.asarray(self.tokenizer.encode(text), dtype=np.int32)
+
+        cut = self._split_point(text)
+        if cut <= 0:
+            return np.asarray(self.tokenizer.encode(text), dtype=np.int32)
+
+        prefix = text[:cut]
+        prefix_ids = self._cache.get(prefix)
+        if prefix_ids is None:
+            prefix_ids = np.asarray(self.tokenizer.encode(prefix), dtype=np.int32)
+            self._cache[prefix] = prefix_ids
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(prefix)
+
+        tail_ids = self.tokenizer.encode(text[cut:], add_special_tokens=False)
+        return np.concatenate([prefix_ids, np.asarray(tail_ids, dtype=np.int32)])
+
+    def _split_point(self, text: str) -> int:
+        """Find a safe boundary near prefix_chars to cut the cached head.
+
+        Cut right after a run of newlines so that multi-newline tokens
+        (e.g. "\\n\\n" in llama vocabs) never straddle the seam. Returns
+        -1 if no such boundary exists.
+        """
+        cut = text.rfind("\n", 0, self.prefix_chars)
+        if cut == -1:
+            return -1
+        cut += 1
+        while cut < len(text) and text[cut] == "\n":
+            cut += 1
+        if cut >= len(text):
+            return -1
+        return cut
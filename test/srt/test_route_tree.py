@@ -0,0 +1,107 @@
+import unittest
+
+from sglang.srt.router.radix_tree import RadixTree
+
+
+class TestRadixTree(unittest.TestCase):
+    def test_insert_and_match(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3, 4])
+        self.assertEqual(list(tree.prefix_match([1, 2, 3, 4, 5])), [1, 2, 3, 4])
+        self.assertEqual(list(tree.prefix_match([1, 2, 7])), [1, 2])
+        self.assertEqual(list(tree.prefix_match([7, 8])), [])
+
+    def test_split(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3, 4])
+        tree.insert([1, 2, 5, 6])
+
+        root = tree.root
+        self.assertEqual(len(root.children), 1)
+        child = next(iter(root.children.values()))
+        self.assertEqual(list(child.ids), [1, 2])
+        self.assertEqual(child.count, 2)
+        self.assertEqual(len(child.children), 2)
+        self.assertEqual(
+            sorted(list(c.ids) for c in child.children.values()), [[3, 4], [5, 6]]
+        )
+
+    def test_count(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3])
+        tree.insert([1, 2, 3])
+        tree.insert([1, 2, 4])
+
+        self.assertEqual(tree.root.count, 3)
+        child = next(iter(tree.root.children.values()))
+        self.assertEqual(list(child.ids), [1, 2])
+        self.assertEqual(child.count, 3)
+
+    def test_delete(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3, 4])
+        tree.insert([1, 2, 5, 6])
+        tree.delete([1, 2, 3, 4])
+
+        self.assertEqual(list(tree.prefix_match([1, 2, 3, 4])), [1, 2])
+        self.assertEqual(list(tree.prefix_match([1, 2, 5, 6])), [1, 2, 5, 6])
+        tree.delete([1, 2, 5, 6])
+        self.assertEqual(list(tree.prefix_match([1, 2, 5, 6])), [])
+        self.assertEqual(len(tree.root.children), 0)
+
+    def test_prefix_match_prune(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3, 4])
+        # Exact whenever the true match can beat prune_len.
+        self.assertEqual(
+            list(tree.prefix_match([1, 2, 3, 4], prune_len=3)), [1, 2, 3, 4]
+        )
+        # Only a lower bound once the tree cannot beat prune_len.
+        self.assertLessEqual(len(tree.prefix_match([1, 2, 3, 4], prune_len=4)), 4)
+
+    def test_max_depth(self):
+        tree = RadixTree()
+        self.assertEqual(tree.root.max_depth, 0)
+        tree.insert([1, 2, 3, 4])
+        self.assertEqual(tree.root.max_depth, 4)
+        tree.insert([1, 2])
+        self.assertEqual(tree.root.max_depth, 4)
+        tree.insert([1, 2, 5, 6, 7])
+        self.assertEqual(tree.root.max_depth, 5)
+
+        tree.delete([1, 2, 5, 6, 7])
+        self.assertEqual(tree.root.max_depth, 4)
+        tree.delete([1, 2, 3, 4])
+        self.assertEqual(tree.root.max_depth, 2)
+
+    def test_truncate(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3, 4, 5, 6])
+        tree.insert([1, 2, 3, 4, 5, 6])
+
+        tree.truncate([1, 2, 3, 4, 5, 6], 3)
+        child = next(iter(tree.root.children.values()))
+        self.assertEqual(list(child.ids), [1, 2, 3])
+        self.assertEqual(child.count, 2)
+        grandchild = next(iter(child.children.values()))
+        self.assertEqual(list(grandchild.ids), [4, 5, 6])
+        self.assertEqual(grandchild.count, 1)
+        self.assertEqual(tree.root.max_depth, 6)
+
+        tree.truncate([1, 2, 3, 4, 5, 6], 3)
+        self.assertEqual(list(tree.prefix_match([1, 2, 3, 4, 5, 6])), [1, 2, 3])
+        self.assertEqual(tree.root.max_depth, 3)
+
+        # keep_len == len(ids) is a no-op.
+        tree.truncate([1, 2, 3], 3)
+        self.assertEqual(tree.root.count, 2)
+
+    def test_delete_missing(self):
+        tree = RadixTree()
+        tree.insert([1, 2, 3])
+        with self.assertRaises(ValueError):
+            tree.delete([4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from sglang.srt.router.token_cache import PrefixTokenCache
+
+
+class CharTokenizer:
+    """Tokenize one character per token, counting encode calls."""
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def encode(self, text, add_special_tokens=True):
+        self.num_calls += 1
+        return [ord(c) for c in text]
+
+
+class TestPrefixTokenCache(unittest.TestCase):
+    def test_short_text_not_cached(self):
+        tokenizer = CharTokenizer()
+        cache = PrefixTokenCache(tokenizer, prefix_chars=16)
+        ids = cache.encode("hello")
+        self.assertEqual(list(ids), [ord(c) for c in "hello"])
+        self.assertEqual(len(cache._cache), 0)
+
+    def test_shared_prefix_encoded_once(self):
+        tokenizer = CharTokenizer()
+        cache = PrefixTokenCache(tokenizer, prefix_chars=32)
+        system_prompt = "You are a helpful assistant.\n"
+
+        ids1 = cache.encode(system_prompt + "first question")
+        ids2 = cache.encode(system_prompt + "second question")
+        self.assertEqual(list(ids1), [ord(c) for c in system_prompt + "first question"])
+        self.assertEqual(
+            list(ids2), [ord(c) for c in system_prompt + "second question"]
+        )
+        # Prefix encode + tail encode for the first request, then only
+        # the tail for the second.
+        self.assertEqual(tokenizer.num_calls, 3)
+
+    def test_no_newline_boundary(self):
+        tokenizer = CharTokenizer()
+        cache = PrefixTokenCache(tokenizer, prefix_chars=8)
+        text = "a" * 32
+        ids = cache.encode(text)
+        self.assertEqual(list(ids), [ord("a")] * 32)
+        self.assertEqual(len(cache._cache), 0)
+
+    def test_capacity_eviction(self):
+        tokenizer = CharTokenizer()
+        cache = PrefixTokenCache(tokenizer, prefix_chars=4, capacity=2)
+        for i in range(3):
+            cache.encode(f"p{i}\ntail of the prompt")
+        self.assertEqual(len(cache._cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()